@@ -1,27 +1,29 @@
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
 def setupLogging():
-    # Create a logger
+    # Create a logger, gated at INFO to match the lowest handler level so
+    # records below it are dropped before any formatting work happens
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(logging.INFO)
     logger.propagate = True
-    
+
     # Create a handler for the general log that rotates daily
     file_handler = TimedRotatingFileHandler(
         'logs/main.log',
-        when='midnight',  
-        interval=1,  
-        backupCount=7  
+        when='midnight',
+        interval=1,
+        backupCount=7
     )
-    file_handler.setLevel(logging.INFO) 
+    file_handler.setLevel(logging.INFO)
 
     # Create a handler for the error log that rotates daily
     error_handler = TimedRotatingFileHandler(
-        'logs/main.error.log', 
-        when='midnight', 
+        'logs/main.error.log',
+        when='midnight',
         interval=1,
-        backupCount=7 
+        backupCount=7
     )
     error_handler.setLevel(logging.ERROR)
 
@@ -32,8 +34,12 @@ def setupLogging():
     file_handler.setFormatter(formatter)
     error_handler.setFormatter(formatter)
 
-    # Add the handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(error_handler)
+    # Request threads only enqueue records; a background listener thread does the
+    # formatting and file writes so request handling never waits on disk I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, file_handler, error_handler, respect_handler_level=True)
+    listener.start()
 
-    logging.info("Logging is set up.")
\ No newline at end of file
+    logging.info("Logging is set up.")
@@ -1,200 +1,285 @@
-import logging
-from fastapi import FastAPI, HTTPException  # Import FastAPI and HTTPException for API creation and error handling
-from loggning import setupLogging
-from pydantic import BaseModel, field_validator, Field   # Import BaseModel for data modeling and field_validator for validation
-from datetime import datetime  # Import datetime for date and time handling
-
-# Configure the logger
-setupLogging()
-
-app = FastAPI()  # Initialize FastAPI instance
-    
-    
-# Data models
-class Classroom(BaseModel):
-    id: int  # Unique identifier for the classroom
-    name: str  # Name of the classroom
-
-class Booking(BaseModel):
-    id: int
-    classroom_id: int
-    student_name: str
-    start_time: str  # Expected format: 'YYYY/MM/DD-HH:MM'
-    end_time: str  # Expected format: 'YYYY/MM/DD-HH:MM'
-
-    # Validator to ensure 'start_time' and 'end_time' have the correct format
-    @field_validator('start_time', 'end_time')
-    def validate_datetime_format(cls, v):
-        try:
-            datetime.strptime(v, '%Y/%m/%d-%H:%M')
-        except ValueError:
-            raise ValueError('Time must be in format YYYY/MM/DD-HH:MM')
-        return v
-
-class Review(BaseModel):
-    classroom_id: int
-    student_name: str
-    rating: int = Field(..., ge=1, le=10, alias="rating (1-10)" ,description="Rating must be between 1-10")  # Begränsar rating mellan 1 och 10
-    comment: str
-
-class ResponseModel(BaseModel):  # Standard response model for consistent API responses
-    status: str
-    message: str
-    data: dict
-
-# In-memory data storage for classrooms, bookings, and reviews
-classrooms = [
-    Classroom(id=1, name="Room A"), Classroom(id=2, name="Room B"),
-    Classroom(id=3, name="Room C"), Classroom(id=4, name="Room D"),
-    Classroom(id=5, name="Room E"), Classroom(id=6, name="Room F"),
-    Classroom(id=7, name="Room G"), Classroom(id=8, name="Room H")
-]
-
-bookings = []
-reviews = []
-
-# Helper function to check classroom availability within a specific time slot
-def is_classroom_available(classroom_id: int, start_time: str, end_time: str, exclude_booking_id: int = None) -> bool:
-    start_time = datetime.strptime(start_time, '%Y/%m/%d-%H:%M')
-    end_time = datetime.strptime(end_time, '%Y/%m/%d-%H:%M')
-    
-    for booking in bookings:
-        if booking.id == exclude_booking_id:  # Skip the booking we’re trying to update
-            continue
-        
-        booking_start = datetime.strptime(booking.start_time, '%Y/%m/%d-%H:%M')
-        booking_end = datetime.strptime(booking.end_time, '%Y/%m/%d-%H:%M')
-        
-        # Check for time overlap within the same classroom
-        if booking.classroom_id == classroom_id and not (end_time <= booking_start or start_time >= booking_end):
-            return False  # Overlapping booking found, classroom is not available
-    return True
-
-# Validate that booking times are within allowed hours (07:00 to 18:00) and occur on the hour
-def validate_booking_times(start_time: str, end_time: str):
-    start = datetime.strptime(start_time, '%Y/%m/%d-%H:%M')
-    end = datetime.strptime(end_time, '%Y/%m/%d-%H:%M')
-    
-    # Check operating hours and whole-hour requirements
-    if start.hour < 7 or end.hour > 18 or (end.hour == 18 and end.minute > 0):
-        raise HTTPException(status_code=422, detail="Bookings allowed between 07:00 and 18:00 only.")
-    if start.minute != 0 or end.minute != 0:
-        raise HTTPException(status_code=422, detail="Bookings can only be made for whole hours.")
-    if start >= end:
-        raise HTTPException(status_code=422, detail="Start time must be before end time.")
-
-# API Endpoints
-
-@app.get("/classrooms")
-def list_classrooms():
-    # Returns all classrooms
-    logging.info(f'Classrooms retrieved successfully {len(classrooms)}')
-    return ResponseModel(
-        status="success",
-        message="Classrooms retrieved successfully",
-        data={"classrooms": [classroom.model_dump() for classroom in classrooms]}
-    )
-
-@app.get("/bookings")
-def list_bookings():
-    # Returns all bookings
-    logging.info(f'Bookings retrieved successfully {len(bookings)}')
-    return ResponseModel(
-        status="success",
-        message="Bookings retrieved successfully",
-        data={"bookings": [booking.model_dump() for booking in bookings]}
-    )
-
-@app.post("/bookings")
-def book_classroom(booking: Booking):
-    # Validate booking times and check classroom availability
-    validate_booking_times(booking.start_time, booking.end_time)
-    if not is_classroom_available(booking.classroom_id, booking.start_time, booking.end_time):
-        logging.error(f"Classroom is not available for the given time slot.")
-        raise HTTPException(status_code=422, detail="Classroom is not available for the given time slot.")
-    
-    # Assign unique ID and add booking to storage
-    booking.id = len(bookings) + 1
-    bookings.append(booking)
-    logging.info(f'Your booking has been confirmed!: {booking.model_dump()}')
-    return ResponseModel(
-        status="success",
-        message="Your booking has been confirmed!",
-        data={"booking": booking.model_dump()}
-    )
-
-@app.put("/bookings/{booking_id}")
-def change_booking(booking_id: int, updated_booking: Booking):
-    # Validate updated booking times
-    validate_booking_times(updated_booking.start_time, updated_booking.end_time)
-    
-    for index, booking in enumerate(bookings):
-        if booking.id == booking_id:
-            # Check classroom availability for updated times, excluding the current booking
-            if not is_classroom_available(updated_booking.classroom_id, updated_booking.start_time, updated_booking.end_time, exclude_booking_id=booking_id):
-                logging.error(f"Classroom is not available for the given time slot.")
-                raise HTTPException(status_code=422, detail="Classroom is not available for the given time slot.")
-            
-            # Update booking and keep the original ID
-            updated_booking.id = booking_id
-            bookings[index] = updated_booking
-            logging.info(f'Your booking has been updated.: {updated_booking.model_dump()}')
-            return ResponseModel(
-                status="success",
-                message="Your booking has been updated.",
-                data={"booking": updated_booking.model_dump()}
-            )
-    
-    # Booking not found
-    raise HTTPException(status_code=404, detail="Booking not found.")
-
-@app.delete("/bookings/{booking_id}")
-def cancel_booking(booking_id: int):
-    # Find and remove the booking by ID
-    for index, booking in enumerate(bookings):
-        if booking.id == booking_id:
-            canceled_booking = bookings.pop(index)
-            logging.info(f'Your booking has been canceled: {canceled_booking.model_dump()}')
-            return ResponseModel(
-                status="success",
-                message="Your booking has been canceled.",
-                data={"booking": canceled_booking.model_dump()}
-            )
-    
-    # Booking not found
-    logging.error(f"Booking not found.")
-    raise HTTPException(status_code=404, detail="Booking not found.")
-   
-
-@app.post("/reviews")
-def add_review(review: Review):
-    # Add a new review to the review list
-    reviews.append(review)
-    logging.info(f'Your review has been submitted: {review.model_dump()}')
-    return ResponseModel(
-        status="success",
-        message="Your review has been submitted!",
-        data={"review": review.model_dump()}
-    )
-    
-@app.get("/reviews")
-def list_reviews(classroom_id: int = None):
-    # Retrieve reviews; filter by classroom_id if provided
-    if classroom_id:
-        filtered_reviews = [review.model_dump() for review in reviews if review.classroom_id == classroom_id]
-        logging.info(f'Reviews retrieved successfully: {filtered_reviews}')
-        return ResponseModel(
-            status="success",
-            message="Reviews retrieved successfully",
-            data={"reviews": filtered_reviews}
-        )
-    
-    # Return all reviews if no filter applied
-    logging.info(f'Reviews retrieved successfully: {[review.model_dump() for review in reviews]}')
-    return ResponseModel(
-        status="success",
-        message="All reviews retrieved successfully",
-        data={"reviews": [review.model_dump() for review in reviews]}
-    )
-
-
+# Perf: Numba/njit is not applicable here — request handling is string/dict-dominated,
+# which Numba's nopython mode cannot compile; use Cython/mypyc + orjson instead.
+import logging
+import re  # Import re for fast booking time format validation
+from bisect import bisect_left  # Import bisect_left for the sorted per-classroom index
+from itertools import count  # Import count for collision-free booking id assignment
+from collections import defaultdict  # Import defaultdict for the per-classroom booking index
+from functools import lru_cache  # Import lru_cache to memoize parsing of recurring time strings
+from fastapi import FastAPI, HTTPException  # Import FastAPI and HTTPException for API creation and error handling
+from fastapi.responses import ORJSONResponse  # Import ORJSONResponse for faster JSON serialization via orjson
+from loggning import setupLogging
+from pydantic import BaseModel, field_validator, field_serializer, model_validator, Field, PrivateAttr   # Import BaseModel for data modeling and validators for validation
+from datetime import datetime  # Import datetime for date and time handling
+
+# Configure the logger
+setupLogging()
+
+app = FastAPI(default_response_class=ORJSONResponse)  # Initialize FastAPI instance, serializing responses with orjson
+
+
+# Convert a datetime to an absolute minute count so time comparisons are plain int compares
+def minute_key(dt: datetime) -> int:
+    return dt.toordinal() * 1440 + dt.hour * 60 + dt.minute
+
+
+# Booking times always use the fixed 16-character format 'YYYY/MM/DD-HH:MM',
+# so validate the shape with one regex and slice out the fields directly
+# instead of running strptime's format interpreter on every request
+BOOKING_TIME_RE = re.compile(r'^\d{4}/\d{2}/\d{2}-\d{2}:\d{2}$')
+
+# Popular slots repeat the same strings across requests, so memoize the pure parse;
+# datetime is immutable, making the cached values safe to share
+@lru_cache(maxsize=4096)
+def parse_booking_time(v: str) -> datetime:
+    try:
+        if BOOKING_TIME_RE.match(v):
+            return datetime(int(v[0:4]), int(v[5:7]), int(v[8:10]), int(v[11:13]), int(v[14:16]))
+    except ValueError:
+        pass  # Out-of-range field, reported below
+    raise ValueError('Time must be in format YYYY/MM/DD-HH:MM')
+
+
+# Data models
+class Classroom(BaseModel):
+    id: int  # Unique identifier for the classroom
+    name: str  # Name of the classroom
+
+class Booking(BaseModel):
+    id: int
+    classroom_id: int
+    student_name: str
+    start_time: datetime  # Accepted as a string in format 'YYYY/MM/DD-HH:MM'
+    end_time: datetime  # Accepted as a string in format 'YYYY/MM/DD-HH:MM'
+
+    # Integer minute keys, cached once at validation so overlap checks are plain int compares
+    _start_key: int = PrivateAttr(default=0)
+    _end_key: int = PrivateAttr(default=0)
+
+    # Parse 'start_time' and 'end_time' once, rejecting anything not in the expected format;
+    # only strings are accepted so Pydantic's lax coercion (e.g. epoch numbers) never applies
+    @field_validator('start_time', 'end_time', mode='before')
+    def validate_datetime_format(cls, v):
+        if not isinstance(v, str):
+            raise ValueError('Time must be in format YYYY/MM/DD-HH:MM')
+        return parse_booking_time(v)
+
+    # Keep the original string format on the wire
+    @field_serializer('start_time', 'end_time')
+    def serialize_datetime_format(self, v: datetime) -> str:
+        return v.strftime('%Y/%m/%d-%H:%M')
+
+    # Cache the parsed times as minute keys after validation
+    @model_validator(mode='after')
+    def cache_parsed_times(self):
+        self._start_key = minute_key(self.start_time)
+        self._end_key = minute_key(self.end_time)
+        return self
+
+class Review(BaseModel):
+    classroom_id: int
+    student_name: str
+    rating: int = Field(..., ge=1, le=10, alias="rating (1-10)" ,description="Rating must be between 1-10")  # Begränsar rating mellan 1 och 10
+    comment: str
+
+# In-memory data storage for classrooms, bookings, and reviews
+classrooms = [
+    Classroom(id=1, name="Room A"), Classroom(id=2, name="Room B"),
+    Classroom(id=3, name="Room C"), Classroom(id=4, name="Room D"),
+    Classroom(id=5, name="Room E"), Classroom(id=6, name="Room F"),
+    Classroom(id=7, name="Room G"), Classroom(id=8, name="Room H")
+]
+
+# The classroom catalog never changes at runtime, so build the /classrooms response once
+classrooms_response = {
+    "status": "success",
+    "message": "Classrooms retrieved successfully",
+    "data": {"classrooms": [classroom.model_dump() for classroom in classrooms]}
+}
+
+bookings_by_id = {}  # Index id -> booking for O(1) lookup in update/cancel
+bookings_by_room = defaultdict(list)  # Index classroom_id -> bookings sorted by start time
+room_start_keys = defaultdict(list)  # Plain-int start keys kept in lockstep with bookings_by_room,
+                                     # so bisect runs on a primitive list without a key callback
+reviews = []
+reviews_by_room = defaultdict(list)  # Index classroom_id -> reviews, so filtered queries skip other rooms
+
+# Monotonic id source; len(bookings) + 1 would hand out duplicate ids after a cancellation
+booking_id_counter = count(1)
+
+# Serialized list payloads, cleared on every write and rebuilt lazily on the next GET
+# so read-heavy traffic dumps each collection once instead of once per request
+bookings_payload = None
+reviews_payload = None
+
+# Insert a booking into its classroom's sorted index
+def add_to_room_index(booking: Booking):
+    keys = room_start_keys[booking.classroom_id]
+    index = bisect_left(keys, booking._start_key)
+    keys.insert(index, booking._start_key)
+    bookings_by_room[booking.classroom_id].insert(index, booking)
+
+# Remove a booking from its classroom's sorted index
+def remove_from_room_index(booking: Booking):
+    room = bookings_by_room[booking.classroom_id]
+    keys = room_start_keys[booking.classroom_id]
+    index = bisect_left(keys, booking._start_key)
+    while room[index].id != booking.id:  # Step past equal start keys to the right booking
+        index += 1
+    del keys[index]
+    del room[index]
+
+# Helper function to check classroom availability within a specific time slot
+def is_classroom_available(classroom_id: int, start_key: int, end_key: int, exclude_booking_id: int = None) -> bool:
+    # The per-room index is sorted by start time, so binary-search to the last booking
+    # starting before our end and walk backwards until the bookings end too early to overlap
+    room = bookings_by_room[classroom_id]
+    index = bisect_left(room_start_keys[classroom_id], end_key) - 1
+    while index >= 0 and room[index]._end_key > start_key:
+        if room[index].id != exclude_booking_id:  # Skip the booking we’re trying to update
+            return False  # Overlapping booking found, classroom is not available
+        index -= 1
+    return True
+
+# Operating hours expressed as minutes into the day, matching the minute keys
+OPEN_MINUTE = 7 * 60
+CLOSE_MINUTE = 18 * 60
+
+# Validate that booking times are within allowed hours (07:00 to 18:00) and occur on the hour
+def validate_booking_times(start_key: int, end_key: int):
+    # Check operating hours and whole-hour requirements on the cached minute keys
+    if start_key % 1440 < OPEN_MINUTE or end_key % 1440 > CLOSE_MINUTE:
+        raise HTTPException(status_code=422, detail="Bookings allowed between 07:00 and 18:00 only.")
+    if start_key % 60 or end_key % 60:
+        raise HTTPException(status_code=422, detail="Bookings can only be made for whole hours.")
+    if start_key >= end_key:
+        raise HTTPException(status_code=422, detail="Start time must be before end time.")
+
+# Validate a booking's times and confirm the classroom is free, in one pass over the cached keys
+def validate_and_check_availability(booking: Booking, exclude_booking_id: int = None):
+    validate_booking_times(booking._start_key, booking._end_key)
+    if not is_classroom_available(booking.classroom_id, booking._start_key, booking._end_key, exclude_booking_id):
+        logging.error("Classroom is not available for the given time slot.")
+        raise HTTPException(status_code=422, detail="Classroom is not available for the given time slot.")
+
+# API Endpoints
+
+@app.get("/classrooms")
+async def list_classrooms():
+    # Returns all classrooms
+    logging.info('Classrooms retrieved successfully %d', len(classrooms))
+    return classrooms_response
+
+@app.get("/bookings")
+async def list_bookings():
+    # Returns all bookings, rebuilding the cached payload if a write invalidated it
+    global bookings_payload
+    if bookings_payload is None:
+        bookings_payload = [booking.model_dump() for booking in bookings_by_id.values()]
+    logging.info('Bookings retrieved successfully %d', len(bookings_by_id))
+    return {
+        "status": "success",
+        "message": "Bookings retrieved successfully",
+        "data": {"bookings": bookings_payload}
+    }
+
+@app.post("/bookings")
+async def book_classroom(booking: Booking):
+    global bookings_payload
+    # Validate booking times and check classroom availability
+    validate_and_check_availability(booking)
+
+    # Assign unique ID and add booking to storage
+    booking.id = next(booking_id_counter)
+    bookings_by_id[booking.id] = booking
+    add_to_room_index(booking)
+    bookings_payload = None
+    logging.info('Booking confirmed id=%d classroom=%d', booking.id, booking.classroom_id)
+    return {
+        "status": "success",
+        "message": "Your booking has been confirmed!",
+        "data": {"booking": booking.model_dump()}
+    }
+
+@app.put("/bookings/{booking_id}")
+async def change_booking(booking_id: int, updated_booking: Booking):
+    global bookings_payload
+    # Look up the booking by ID
+    booking = bookings_by_id.get(booking_id)
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found.")
+
+    # Validate the updated times and check availability, excluding the current booking
+    validate_and_check_availability(updated_booking, exclude_booking_id=booking_id)
+
+    # Update booking and keep the original ID
+    updated_booking.id = booking_id
+    bookings_by_id[booking_id] = updated_booking
+    remove_from_room_index(booking)
+    add_to_room_index(updated_booking)
+    bookings_payload = None
+    logging.info('Booking updated id=%d classroom=%d', booking_id, updated_booking.classroom_id)
+    return {
+        "status": "success",
+        "message": "Your booking has been updated.",
+        "data": {"booking": updated_booking.model_dump()}
+    }
+
+@app.delete("/bookings/{booking_id}")
+async def cancel_booking(booking_id: int):
+    global bookings_payload
+    # Find and remove the booking by ID
+    canceled_booking = bookings_by_id.pop(booking_id, None)
+    if canceled_booking is None:
+        # Booking not found
+        logging.error("Booking not found.")
+        raise HTTPException(status_code=404, detail="Booking not found.")
+
+    remove_from_room_index(canceled_booking)
+    bookings_payload = None
+    logging.info('Booking canceled id=%d classroom=%d', booking_id, canceled_booking.classroom_id)
+    return {
+        "status": "success",
+        "message": "Your booking has been canceled.",
+        "data": {"booking": canceled_booking.model_dump()}
+    }
+   
+
+@app.post("/reviews")
+async def add_review(review: Review):
+    global reviews_payload
+    # Add a new review to the review list and the per-classroom index
+    reviews.append(review)
+    reviews_by_room[review.classroom_id].append(review)
+    reviews_payload = None
+    logging.info('Review submitted classroom=%d rating=%d', review.classroom_id, review.rating)
+    return {
+        "status": "success",
+        "message": "Your review has been submitted!",
+        "data": {"review": review.model_dump()}
+    }
+    
+@app.get("/reviews")
+async def list_reviews(classroom_id: int = None):
+    # Retrieve reviews; serve from the per-classroom index if a filter is provided
+    if classroom_id:
+        filtered_reviews = [review.model_dump() for review in reviews_by_room.get(classroom_id, [])]
+        logging.info('Reviews retrieved successfully %d', len(filtered_reviews))
+        return {
+            "status": "success",
+            "message": "Reviews retrieved successfully",
+            "data": {"reviews": filtered_reviews}
+        }
+    
+    # Return all reviews if no filter applied, rebuilding the cached payload if needed
+    global reviews_payload
+    if reviews_payload is None:
+        reviews_payload = [review.model_dump() for review in reviews]
+    logging.info('Reviews retrieved successfully %d', len(reviews))
+    return {
+        "status": "success",
+        "message": "All reviews retrieved successfully",
+        "data": {"reviews": reviews_payload}
+    }
+
+